@@ -3,7 +3,7 @@ Smart Keyframe Extractor - 智能视频关键帧提取工具
 支持自适应视频时长，可按固定时间间隔自动计算帧数，支持分辨率选择，返回base64编码用于AI分析
 """
 
-from .extractor import SmartKeyFrameExtractor, extract_top_k_keyframes
+from .extractor import SmartKeyFrameExtractor, extract_top_k_keyframes, extract_keyframes_batch
 from .vision_utils import (
     process_vision_info, 
     smart_resize, 
@@ -15,21 +15,45 @@ from .vision_utils import (
 )
 
 # Azure OpenAI集成（可选导入）
-try:
-    from .azure_openai import AzureOpenAIAnalyzer, analyze_video_with_azure_openai
-    _has_azure = True
-except ImportError:
-    _has_azure = False
-    AzureOpenAIAnalyzer = None
-    analyze_video_with_azure_openai = None
+# 首次访问相关名称时才导入azure_openai模块，避免每次 import 本包
+# （包括批量处理的每个工作进程）都加载较重的openai包；
+# 导入失败时与之前一样，相关名称为None
+_AZURE_EXPORTS = ("AzureOpenAIAnalyzer", "analyze_video_with_azure_openai")
+
+
+def _load_azure():
+    """导入Azure相关名称，并据导入结果设置 _has_azure 和 __all__"""
+    names = globals()
+    try:
+        from .azure_openai import AzureOpenAIAnalyzer, analyze_video_with_azure_openai
+        names.update(_has_azure=True,
+                     AzureOpenAIAnalyzer=AzureOpenAIAnalyzer,
+                     analyze_video_with_azure_openai=analyze_video_with_azure_openai)
+    except ImportError:
+        names.update(_has_azure=False,
+                     AzureOpenAIAnalyzer=None,
+                     analyze_video_with_azure_openai=None)
+    
+    # 只有在成功导入Azure相关模块时才添加到__all__
+    names['__all__'] = _BASE_ALL + (list(_AZURE_EXPORTS) if names['_has_azure'] else [])
+
+
+def __getattr__(name):
+    # __all__ 也按需计算：from smart_keyframe_extractor import * 时才尝试导入Azure模块
+    if name in _AZURE_EXPORTS or name in ("_has_azure", "__all__"):
+        _load_azure()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __version__ = "0.1.0"
 __author__ = "jiajunchen"
 __email__ = "your-email@example.com"
 
-__all__ = [
+_BASE_ALL = [
     "SmartKeyFrameExtractor",
     "extract_top_k_keyframes", 
+    "extract_keyframes_batch",
     "process_vision_info",
     "smart_resize",
     "fetch_image",
@@ -38,10 +62,3 @@ __all__ = [
     "prepare_azure_openai_messages",
     "calculate_token_usage"
 ]
-
-# 只有在成功导入Azure相关模块时才添加到__all__
-if _has_azure:
-    __all__.extend([
-        "AzureOpenAIAnalyzer",
-        "analyze_video_with_azure_openai"
-    ])
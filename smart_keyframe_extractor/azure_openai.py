@@ -5,10 +5,14 @@ Azure OpenAI 集成模块
 
 import os
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional, Union
 import logging
 from openai import AzureOpenAI
 
+from .extractor import extract_top_k_keyframes
+
 logger = logging.getLogger(__name__)
 
 
@@ -171,20 +175,22 @@ class AzureOpenAIAnalyzer:
         
         return messages
     
-    def batch_analyze_videos(self, video_results: List[Dict], **kwargs) -> List[Dict]:
+    def batch_analyze_videos(self, video_results: List[Dict], max_workers: int = 4,
+                             **kwargs) -> List[Dict]:
         """
         批量分析多个视频的关键帧
         
+        各视频的API请求相互独立且以网络等待为主，使用线程池并发请求。
+        
         Args:
             video_results: 多个视频的提取结果列表
+            max_workers: 并发请求数，为1时顺序请求
             **kwargs: 传递给analyze_video_frames的参数
         
         Returns:
-            批量分析结果列表
+            批量分析结果列表，顺序与video_results一致
         """
-        results = []
-        
-        for i, video_result in enumerate(video_results):
+        def analyze(i: int, video_result: Dict) -> Dict:
             if 'frames' in video_result and video_result['frames']:
                 logger.info(f"分析第 {i+1}/{len(video_results)} 个视频...")
                 
@@ -192,16 +198,21 @@ class AzureOpenAIAnalyzer:
                 analysis['video_path'] = video_result.get('video_path', f'video_{i+1}')
                 analysis['video_duration'] = video_result.get('video_duration', 0)
                 
-                results.append(analysis)
-            else:
-                logger.warning(f"第 {i+1} 个视频没有有效的关键帧")
-                results.append({
-                    'success': False,
-                    'error': '没有有效的关键帧',
-                    'video_path': video_result.get('video_path', f'video_{i+1}')
-                })
+                return analysis
+            
+            logger.warning(f"第 {i+1} 个视频没有有效的关键帧")
+            return {
+                'success': False,
+                'error': '没有有效的关键帧',
+                'video_path': video_result.get('video_path', f'video_{i+1}')
+            }
         
-        return results
+        workers = min(max_workers, len(video_results))
+        if workers <= 1:
+            return [analyze(i, video_result) for i, video_result in enumerate(video_results)]
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(analyze, range(len(video_results)), video_results))
 
 
 def analyze_video_with_azure_openai(video_path: str,
@@ -228,9 +239,8 @@ def analyze_video_with_azure_openai(video_path: str,
     Returns:
         包含关键帧提取和AI分析结果的字典
     """
-    from .extractor import extract_top_k_keyframes
-    
     logger.info(f"开始完整视频分析流程: {video_path}")
+    start_time = time.perf_counter()
     
     # 1. 提取关键帧
     logger.info("步骤 1/2: 提取视频关键帧...")
@@ -265,7 +275,7 @@ def analyze_video_with_azure_openai(video_path: str,
             'success': analysis_result['success'],
             'video_analysis': analysis_result,
             'keyframe_extraction': extract_result,
-            'total_processing_time': None  # 可以添加时间统计
+            'total_processing_time': time.perf_counter() - start_time
         }
         
         if analysis_result['success']:
@@ -6,7 +6,7 @@
 import sys
 import argparse
 import logging
-from smart_keyframe_extractor.extractor import extract_top_k_keyframes
+from smart_keyframe_extractor.extractor import extract_top_k_keyframes, DEFAULT_FFMPEG_WORKERS
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +54,12 @@ def main():
                        help='返回base64编码（用于AI分析）')
     parser.add_argument('--save-files', action='store_true',
                        help='保存图像文件到磁盘')
+    parser.add_argument('--cache-dir',
+                       help='帧特征缓存目录，重复处理同一视频时跳过帧分析')
+    parser.add_argument('--workers', type=int, default=DEFAULT_FFMPEG_WORKERS,
+                       help='并行提取关键帧的FFmpeg进程数')
+    parser.add_argument('--hw-accel', action='store_true',
+                       help='分析帧变化时尝试使用硬件解码')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='详细输出')
     
@@ -88,7 +94,10 @@ def main():
         max_frames=args.max_frames,
         resolution=args.resolution,
         return_base64=args.base64,
-        save_files=args.save_files
+        save_files=args.save_files,
+        cache_dir=args.cache_dir,
+        max_workers=args.workers,
+        hw_accel=args.hw_accel
     )
     
     if 'error' in result:
@@ -97,14 +106,14 @@ def main():
     
     # 输出base64结果（用于Azure OpenAI分析）
     if args.base64:
-        print("\n" + "="*50)
-        print("Azure OpenAI 分析用 Base64 数据:")
-        print("="*50)
+        # 先拼接全部输出再一次性写入，避免逐行print
+        lines = ["\n" + "="*50, "Azure OpenAI 分析用 Base64 数据:", "="*50]
         for i, frame in enumerate(result['frames']):
             if 'base64' in frame:
-                print(f"\n帧 {i+1} (时间: {frame['timestamp']:.1f}s):")
-                print(f"data:image/jpeg;base64,{frame['base64'][:100]}...")
-                print(f"完整长度: {len(frame['base64'])} 字符")
+                lines.append(f"\n帧 {i+1} (时间: {frame['timestamp']:.1f}s):")
+                lines.append(f"data:image/jpeg;base64,{frame['base64'][:100]}...")
+                lines.append(f"完整长度: {len(frame['base64'])} 字符")
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
@@ -16,10 +16,23 @@ import tempfile
 from typing import List, Dict, Tuple, Optional, Union
 import shutil
 import sys
+import time
+import queue
+import threading
 import logging
+import hashlib
+import functools
+import bisect
+from collections import Counter
 from pathlib import Path
 import heapq
 from io import BytesIO
+from concurrent.futures import (ThreadPoolExecutor, ProcessPoolExecutor, wait,
+                                as_completed, FIRST_COMPLETED)
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+from contextlib import closing, contextmanager
+import atexit
 
 # 配置日志
 logging.basicConfig(
@@ -28,6 +41,84 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 并行提取关键帧时默认的FFmpeg进程数
+DEFAULT_FFMPEG_WORKERS = min(4, os.cpu_count() or 1)
+
+# 解码线程预读的最大帧数（有界队列提供背压）
+FRAME_PREFETCH = 8
+
+# 批量处理时平均每个工作进程处理的视频数，达到后替换整个进程池以释放原生代码占用的内存
+BATCH_MAX_TASKS_PER_CHILD = 10
+
+# 预定义的输出分辨率 (宽, 高)
+RESOLUTION_MAP = {
+    '1080p': (1920, 1080),
+    '720p': (1280, 720),
+    '480p': (854, 480),
+    '360p': (640, 360),
+    '240p': (426, 240)
+}
+
+# 自适应模式的时长分档: (时长上限秒, 最多帧数, 每帧间隔秒)
+ADAPTIVE_FRAME_TIERS = (
+    (30, 5, 5),              # 短视频（<=30秒），约每5秒1帧
+    (60, 8, 7),              # 中等视频（30-60秒），约每7秒1帧
+    (300, 15, 15),           # 较长视频（1-5分钟），约每15秒1帧
+    (float('inf'), 20, 20),  # 长视频（>5分钟），约每20秒1帧
+)
+
+# Farneback光流参数，帧分析与批量进程预热共用
+OPTICAL_FLOW_PARAMS = dict(
+    pyr_scale=0.5,
+    levels=3,
+    winsize=15,
+    iterations=3,
+    poly_n=5,
+    poly_sigma=1.2,
+    flags=0
+)
+
+# 帧特征缓存格式版本，评分算法变化时递增以使旧缓存失效
+FEATURE_CACHE_VERSION = 1
+
+# 缓存中保存的逐帧特征字段
+FEATURE_FIELDS = ('frame_idx', 'timestamp', 'change_score', 'scene_score',
+                  'motion_score', 'color_score', 'edge_score')
+
+
+# 已找到的可执行文件路径，只缓存查找成功的结果，之后才安装或加入PATH的工具仍能被找到
+_executable_paths: Dict[str, str] = {}
+
+
+def _resolve_executable(name: str) -> Optional[str]:
+    """解析可执行文件的绝对路径（找到后每个进程不再重复查找PATH）"""
+    path = _executable_paths.get(name)
+    if path is None:
+        path = shutil.which(name)
+        if path is not None:
+            _executable_paths[name] = path
+    return path
+
+
+@contextmanager
+def _open_video(video_path: str, hw_accel: bool = False):
+    """打开视频的上下文管理器，退出时（包括异常时）释放底层解码器句柄"""
+    cap = SmartKeyFrameExtractor._open_capture(video_path, hw_accel)
+    try:
+        yield cap
+    finally:
+        cap.release()
+
+
+@functools.lru_cache(maxsize=256)
+def _probe_video_info(video_path: str, mtime_ns: int, size: int) -> Optional[Dict]:
+    """打开视频读取元数据；mtime_ns 和 size 仅作为缓存键，文件变化后重新读取"""
+    with _open_video(video_path) as cap:
+        if not cap.isOpened():
+            return None
+        
+        return SmartKeyFrameExtractor._read_video_info(cap)
+
 
 class SmartKeyFrameExtractor:
     """智能关键帧提取器 - 支持base64输出"""
@@ -38,21 +129,14 @@ class SmartKeyFrameExtractor:
         self._check_installations()
     
     def _check_installations(self):
-        """检查依赖"""
-        try:
-            subprocess.run([self.ffmpeg_path, '-version'], capture_output=True, check=True)
-            subprocess.run([self.ffprobe_path, '-version'], capture_output=True, check=True)
-            import cv2
-        except:
-            raise RuntimeError("请确保安装了 FFmpeg 和 opencv-python")
+        """检查依赖（cv2 已在模块级导入，这里只需在进程内查找 FFmpeg 可执行文件）"""
+        for tool in (self.ffmpeg_path, self.ffprobe_path):
+            if _resolve_executable(tool) is None:
+                raise RuntimeError("请确保安装了 FFmpeg 和 opencv-python")
     
-    def get_video_info(self, video_path: str) -> Optional[Dict]:
-        """获取视频信息"""
-        cap = cv2.VideoCapture(video_path)
-        
-        if not cap.isOpened():
-            return None
-        
+    @staticmethod
+    def _read_video_info(cap: cv2.VideoCapture) -> Dict:
+        """从已打开的VideoCapture读取视频信息"""
         info = {
             'total_frames': int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
             'fps': cap.get(cv2.CAP_PROP_FPS),
@@ -60,10 +144,18 @@ class SmartKeyFrameExtractor:
             'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         }
         info['duration'] = info['total_frames'] / info['fps'] if info['fps'] > 0 else 0
-        
-        cap.release()
         return info
     
+    def get_video_info(self, video_path: str) -> Optional[Dict]:
+        """获取视频信息（按文件路径、修改时间和大小缓存，文件未变化时不重复打开视频）"""
+        try:
+            stat = os.stat(video_path)
+        except OSError:
+            return None
+        
+        info = _probe_video_info(os.path.abspath(video_path), stat.st_mtime_ns, stat.st_size)
+        return dict(info) if info else None
+    
     def get_resolution_params(self, resolution: str, original_width: int, original_height: int) -> Tuple[Optional[str], Optional[str]]:
         """
         根据分辨率选项返回FFmpeg的scale参数
@@ -79,20 +171,11 @@ class SmartKeyFrameExtractor:
         if resolution == 'original':
             return None, None
         
-        # 预定义的分辨率
-        resolution_map = {
-            '1080p': (1920, 1080),
-            '720p': (1280, 720),
-            '480p': (854, 480),
-            '360p': (640, 360),
-            '240p': (426, 240)
-        }
-        
-        if resolution not in resolution_map:
+        if resolution not in RESOLUTION_MAP:
             logger.warning(f"未知分辨率 '{resolution}'，使用原始分辨率")
             return None, None
         
-        target_width, target_height = resolution_map[resolution]
+        target_width, target_height = RESOLUTION_MAP[resolution]
         
         # 计算缩放比例，保持宽高比
         scale_ratio = min(target_width / original_width, target_height / original_height)
@@ -139,15 +222,11 @@ class SmartKeyFrameExtractor:
             calculated_frames = int(intervals * frames_per_interval)
             
         elif mode == "adaptive":
-            # 自适应模式：根据视频长度动态调整
-            if duration <= 30:  # 短视频（<=30秒）
-                calculated_frames = min(5, int(duration / 5))  # 约每5秒1帧
-            elif duration <= 60:  # 中等视频（30-60秒）
-                calculated_frames = min(8, int(duration / 7))  # 约每7秒1帧
-            elif duration <= 300:  # 较长视频（1-5分钟）
-                calculated_frames = min(15, int(duration / 15))  # 约每15秒1帧
-            else:  # 长视频（>5分钟）
-                calculated_frames = min(20, int(duration / 20))  # 约每20秒1帧
+            # 自适应模式：根据视频长度动态调整，分档见 ADAPTIVE_FRAME_TIERS
+            for max_duration, tier_frames, seconds_per_frame in ADAPTIVE_FRAME_TIERS:
+                if duration <= max_duration:
+                    calculated_frames = min(tier_frames, int(duration / seconds_per_frame))
+                    break
         
         else:
             raise ValueError(f"未知模式: {mode}")
@@ -160,14 +239,186 @@ class SmartKeyFrameExtractor:
         
         return final_count
     
-    def compute_frame_changes(self, video_path: str, sample_rate: int = 1) -> Tuple[List[Dict], Dict]:
-        """计算所有帧的变化分数"""
+    def _feature_cache_path(self, video_path: str, sample_rate: int, cache_dir: str) -> Optional[str]:
+        """根据视频路径、修改时间、大小和采样率生成特征缓存文件路径，视频不存在时返回None"""
+        try:
+            stat = os.stat(video_path)
+        except OSError:
+            return None
+        key = f"{os.path.abspath(video_path)}|{stat.st_mtime_ns}|{stat.st_size}|{sample_rate}|{FEATURE_CACHE_VERSION}"
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(cache_dir, f"{digest}.npz")
+    
+    def _load_feature_cache(self, cache_path: str) -> Tuple[List[Dict], Dict]:
+        """从缓存文件加载帧变化分数"""
+        try:
+            with np.load(cache_path) as data:
+                video_info = json.loads(str(data['video_info']))
+                columns = {field: data[field].tolist() for field in FEATURE_FIELDS}
+        except Exception as e:
+            # 缓存文件可能被截断或损坏（BadZipFile、EOFError等），删除后重新分析
+            logger.warning(f"读取特征缓存失败，将重新分析: {e}")
+            try:
+                os.remove(cache_path)
+            except OSError:
+                pass
+            return [], {}
         
-        cap = cv2.VideoCapture(video_path)
-        video_info = self.get_video_info(video_path)
+        frame_changes = [dict(zip(FEATURE_FIELDS, values)) for values in zip(*columns.values())]
+        return frame_changes, video_info
+    
+    def _save_feature_cache(self, cache_path: str, frame_changes: List[Dict], video_info: Dict):
+        """将帧变化分数写入缓存文件"""
+        columns = {
+            field: np.array([frame.get(field, 0.0) for frame in frame_changes],
+                            dtype=np.int64 if field == 'frame_idx' else np.float64)
+            for field in FEATURE_FIELDS
+        }
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez_compressed(f, video_info=np.array(json.dumps(video_info)), **columns)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"写入特征缓存失败: {e}")
+    
+    def _iter_sampled_frames(self, cap: cv2.VideoCapture, sample_rate: int,
+                             scale_factor: float, prefetch: int = FRAME_PREFETCH):
+        """
+        在后台线程中解码并降采样帧，通过有界队列交给调用方计算
         
-        if not video_info:
-            return [], {}
+        OpenCV解码和缩放会释放GIL，解码与特征计算因此可以重叠执行。
+        
+        Yields:
+            (帧序号, 降采样后的帧) 元组
+        """
+        frame_queue = queue.Queue(maxsize=prefetch)
+        stop_event = threading.Event()
+        
+        def put(item) -> bool:
+            while not stop_event.is_set():
+                try:
+                    frame_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def reader():
+            # 解码缓冲区在读取线程内复用，避免每帧重新分配大数组
+            frame = None
+            frame_count = 0
+            try:
+                while True:
+                    # 采样读取
+                    ret = False
+                    for _ in range(sample_rate):
+                        ret = cap.grab()
+                        if not ret:
+                            break
+                        frame_count += 1
+                    
+                    if not ret:
+                        break
+                    
+                    ret, frame = cap.retrieve(frame)
+                    if not ret:
+                        break
+                    
+                    # 降低分辨率
+                    frame_small = cv2.resize(frame, None, fx=scale_factor, fy=scale_factor)
+                    if not put((frame_count, frame_small)):
+                        break
+            except Exception as e:
+                # 解码异常交给调用方重新抛出，不能当作正常的读取结束
+                put(e)
+            finally:
+                put(None)
+        
+        reader_thread = threading.Thread(target=reader, name='frame-reader', daemon=True)
+        reader_thread.start()
+        
+        try:
+            while True:
+                item = frame_queue.get()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop_event.set()
+            reader_thread.join()
+    
+    @staticmethod
+    def _open_capture(video_path: str, hw_accel: bool = False) -> cv2.VideoCapture:
+        """打开视频（优先FFmpeg后端），hw_accel=True 时请求硬件解码（OpenCV不支持时自动回退到软件解码）"""
+        # 本地文件不存在时直接返回未打开的VideoCapture，不必让每个后端都尝试打开一次
+        if '://' not in video_path and not os.path.isfile(video_path):
+            return cv2.VideoCapture()
+        
+        if hw_accel and hasattr(cv2, 'CAP_PROP_HW_ACCELERATION'):
+            cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG, [
+                cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY
+            ])
+            if cap.isOpened():
+                return cap
+            logger.warning("硬件解码不可用，回退到软件解码")
+        
+        # 直接指定FFmpeg后端，跳过对其它后端的逐个探测；FFmpeg后端不可用时再自动选择
+        cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG)
+        if cap.isOpened():
+            return cap
+        return cv2.VideoCapture(video_path)
+    
+    @staticmethod
+    def _color_hist(frame: np.ndarray) -> np.ndarray:
+        """计算帧的归一化HSV颜色直方图（H、S两个通道）"""
+        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        hist = cv2.calcHist([hsv], [0, 1], None, [50, 60], [0, 180, 0, 256])
+        return cv2.normalize(hist, hist).flatten()
+    
+    def compute_frame_changes(self, video_path: str, sample_rate: int = 1,
+                              cache_dir: Optional[str] = None,
+                              hw_accel: bool = False) -> Tuple[List[Dict], Dict]:
+        """
+        计算所有帧的变化分数
+        
+        Args:
+            video_path: 视频文件路径
+            sample_rate: 采样间隔（帧）
+            cache_dir: 特征缓存目录（可选），同一视频重复分析时直接读取缓存
+            hw_accel: 是否尝试使用硬件解码
+        """
+        if cache_dir:
+            cache_path = self._feature_cache_path(video_path, sample_rate, cache_dir)
+            if cache_path is None:
+                logger.error(f"无法打开视频: {video_path}")
+                return [], {}
+            if os.path.exists(cache_path):
+                frame_changes, video_info = self._load_feature_cache(cache_path)
+                if frame_changes:
+                    logger.info(f"使用缓存的帧特征: {cache_path}")
+                    return frame_changes, video_info
+            
+            frame_changes, video_info = self.compute_frame_changes(
+                video_path, sample_rate, hw_accel=hw_accel
+            )
+            if frame_changes:
+                self._save_feature_cache(cache_path, frame_changes, video_info)
+            return frame_changes, video_info
+        
+        # 只打开一次视频，元数据直接从同一个VideoCapture读取
+        with _open_video(video_path, hw_accel) as cap:
+            if not cap.isOpened():
+                return [], {}
+            
+            return self._analyze_capture(cap, sample_rate)
+    
+    def _analyze_capture(self, cap: cv2.VideoCapture, sample_rate: int) -> Tuple[List[Dict], Dict]:
+        """在已打开的VideoCapture上逐帧计算变化分数（由调用方负责释放cap）"""
+        video_info = self._read_video_info(cap)
         
         logger.info(f"视频信息: {video_info['total_frames']} 帧, "
                    f"{video_info['fps']:.2f} fps, {video_info['duration']:.2f} 秒")
@@ -178,7 +429,6 @@ class SmartKeyFrameExtractor:
         # 读取第一帧
         ret, first_frame = cap.read()
         if not ret:
-            cap.release()
             return [], {}
         
         # 降低分辨率
@@ -195,95 +445,77 @@ class SmartKeyFrameExtractor:
             'change_score': 0.0,  # 第一帧没有变化
             'scene_score': 0.0,
             'motion_score': 0.0,
-            'color_score': 0.0
+            'color_score': 0.0,
+            'edge_score': 0.0
         })
         
-        # 光流参数
-        flow_params = dict(
-            pyr_scale=0.5,
-            levels=3,
-            winsize=15,
-            iterations=3,
-            poly_n=5,
-            poly_sigma=1.2,
-            flags=0
-        )
+        # 前一帧的直方图和边缘在下一轮直接复用，每帧只需计算一次
+        prev_hist = self._color_hist(first_frame_small)
+        prev_edges = cv2.Canny(prev_gray, 50, 150)
         
-        frame_count = 0
-        prev_hsv = cv2.cvtColor(first_frame_small, cv2.COLOR_BGR2HSV)
+        # 约每10%输出一次进度（至少间隔50帧），长视频不再每50帧刷一次日志
+        progress_step = max(video_info['total_frames'] // 10, 50)
+        next_progress = progress_step
         
-        while True:
-            # 采样读取
-            for _ in range(sample_rate):
-                ret = cap.grab()
-                if not ret:
-                    break
-                frame_count += 1
-            
-            if not ret:
-                break
-            
-            ret, frame = cap.retrieve()
-            if not ret:
-                break
-            
-            # 降低分辨率
-            frame_small = cv2.resize(frame, None, fx=scale_factor, fy=scale_factor)
-            curr_gray = cv2.cvtColor(frame_small, cv2.COLOR_BGR2GRAY)
-            curr_hsv = cv2.cvtColor(frame_small, cv2.COLOR_BGR2HSV)
-            
-            # 1. 计算光流 (运动分数)
-            try:
-                flow = cv2.calcOpticalFlowFarneback(prev_gray, curr_gray, None, **flow_params)
-                magnitude, angle = cv2.cartToPolar(flow[..., 0], flow[..., 1])
-                motion_score = np.mean(magnitude) * 10  # 放大系数
-            except:
-                motion_score = 0.0
-            
-            # 2. 计算像素差异 (场景变化分数)
-            pixel_diff = cv2.absdiff(prev_gray, curr_gray)
-            scene_score = np.mean(pixel_diff)
-            
-            # 3. 计算颜色直方图差异
-            hist_prev = cv2.calcHist([prev_hsv], [0, 1], None, [50, 60], [0, 180, 0, 256])
-            hist_curr = cv2.calcHist([curr_hsv], [0, 1], None, [50, 60], [0, 180, 0, 256])
-            hist_prev = cv2.normalize(hist_prev, hist_prev).flatten()
-            hist_curr = cv2.normalize(hist_curr, hist_curr).flatten()
-            color_score = cv2.compareHist(hist_prev, hist_curr, cv2.HISTCMP_CHISQR)
-            
-            # 4. 边缘变化分数
-            edges_prev = cv2.Canny(prev_gray, 50, 150)
-            edges_curr = cv2.Canny(curr_gray, 50, 150)
-            edge_diff = cv2.absdiff(edges_prev, edges_curr)
-            edge_score = np.sum(edge_diff) / (edge_diff.shape[0] * edge_diff.shape[1]) * 100
-            
-            # 综合变化分数
-            total_score = (
-                motion_score * 2.0 +      # 运动权重最高
-                scene_score * 1.5 +       # 场景变化次之
-                color_score * 0.5 +       # 颜色变化
-                edge_score * 1.0          # 边缘变化
-            )
-            
-            frame_changes.append({
-                'frame_idx': frame_count,
-                'timestamp': frame_count / video_info['fps'],
-                'change_score': total_score,
-                'scene_score': scene_score,
-                'motion_score': motion_score,
-                'color_score': color_score,
-                'edge_score': edge_score
-            })
-            
-            # 更新前一帧
-            prev_gray = curr_gray
-            prev_hsv = curr_hsv
-            
-            # 进度提示
-            if frame_count % 50 == 0:
-                logger.info(f"已分析 {frame_count}/{video_info['total_frames']} 帧...")
+        # 循环内反复用到的值提前绑定为局部变量
+        fps = video_info['fps']
+        total_frames = video_info['total_frames']
+        color_hist = self._color_hist
         
-        cap.release()
+        # 读取线程必须在cap释放前停止，closing 保证异常时也会关闭生成器
+        with closing(self._iter_sampled_frames(cap, sample_rate, scale_factor)) as frames:
+            for frame_count, frame_small in frames:
+                curr_gray = cv2.cvtColor(frame_small, cv2.COLOR_BGR2GRAY)
+                
+                # 1. 计算光流 (运动分数)
+                try:
+                    flow = cv2.calcOpticalFlowFarneback(prev_gray, curr_gray, None, **OPTICAL_FLOW_PARAMS)
+                    # 只需要幅值，cv2.magnitude 省去 cartToPolar 的角度计算
+                    magnitude = cv2.magnitude(flow[..., 0], flow[..., 1])
+                    motion_score = cv2.mean(magnitude)[0] * 10  # 放大系数
+                except:
+                    motion_score = 0.0
+                
+                # 2. 计算像素差异 (场景变化分数)
+                pixel_diff = cv2.absdiff(prev_gray, curr_gray)
+                scene_score = cv2.mean(pixel_diff)[0]
+                
+                # 3. 计算颜色直方图差异
+                curr_hist = color_hist(frame_small)
+                color_score = cv2.compareHist(prev_hist, curr_hist, cv2.HISTCMP_CHISQR)
+                
+                # 4. 边缘变化分数
+                curr_edges = cv2.Canny(curr_gray, 50, 150)
+                edge_diff = cv2.absdiff(prev_edges, curr_edges)
+                edge_score = cv2.mean(edge_diff)[0] * 100
+                
+                # 综合变化分数
+                total_score = (
+                    motion_score * 2.0 +      # 运动权重最高
+                    scene_score * 1.5 +       # 场景变化次之
+                    color_score * 0.5 +       # 颜色变化
+                    edge_score * 1.0          # 边缘变化
+                )
+                
+                frame_changes.append({
+                    'frame_idx': frame_count,
+                    'timestamp': frame_count / fps,
+                    'change_score': total_score,
+                    'scene_score': scene_score,
+                    'motion_score': motion_score,
+                    'color_score': color_score,
+                    'edge_score': edge_score
+                })
+                
+                # 更新前一帧
+                prev_gray = curr_gray
+                prev_hist = curr_hist
+                prev_edges = curr_edges
+                
+                # 进度提示
+                if frame_count >= next_progress:
+                    logger.info(f"已分析 {frame_count}/{total_frames} 帧...")
+                    next_progress = (frame_count // progress_step + 1) * progress_step
         
         logger.info(f"帧分析完成，共计算了 {len(frame_changes)} 帧的变化分数")
         
@@ -300,9 +532,24 @@ class SmartKeyFrameExtractor:
         
         # 2. 使用贪心算法选择既有高分又有多样性的帧
         selected_frames = []
+        # 已选帧的索引集合和有序时间戳，用于O(1)去重和O(log k)间隔检查
+        selected_indices = set()
+        selected_times = []
+        
+        def select(frame):
+            selected_frames.append(frame)
+            selected_indices.add(frame['frame_idx'])
+            bisect.insort(selected_times, frame['timestamp'])
+        
+        def too_close(timestamp, interval):
+            # 只需检查时间上相邻的两个已选帧
+            pos = bisect.bisect_left(selected_times, timestamp)
+            if pos < len(selected_times) and selected_times[pos] - timestamp < interval:
+                return True
+            return pos > 0 and timestamp - selected_times[pos - 1] < interval
         
         # 始终包含第一帧（提供上下文）
-        selected_frames.append(frame_changes[0])
+        select(frame_changes[0])
         k -= 1
         
         # 最小时间间隔（秒）- 根据总帧数动态调整
@@ -317,14 +564,9 @@ class SmartKeyFrameExtractor:
                 break
             
             # 检查时间间隔
-            too_close = False
-            for selected in selected_frames:
-                if abs(frame['timestamp'] - selected['timestamp']) < min_time_interval:
-                    too_close = True
-                    break
-            
-            if not too_close and frame not in selected_frames:
-                selected_frames.append(frame)
+            if (not too_close(frame['timestamp'], min_time_interval)
+                    and frame['frame_idx'] not in selected_indices):
+                select(frame)
         
         # 如果还没选够（时间间隔限制太严），放宽限制
         if len(selected_frames) < k + 1:
@@ -334,32 +576,27 @@ class SmartKeyFrameExtractor:
                 if len(selected_frames) >= k + 1:
                     break
                 
-                if frame not in selected_frames:
-                    too_close = False
-                    for selected in selected_frames:
-                        if abs(frame['timestamp'] - selected['timestamp']) < min_time_interval:
-                            too_close = True
-                            break
-                    
-                    if not too_close:
-                        selected_frames.append(frame)
+                if (frame['frame_idx'] not in selected_indices
+                        and not too_close(frame['timestamp'], min_time_interval)):
+                    select(frame)
         
         # 按时间排序
         selected_frames.sort(key=lambda x: x['timestamp'])
         
-        # 输出选中帧的信息
-        logger.info("\n选中的关键帧:")
-        for i, frame in enumerate(selected_frames):
-            logger.info(f"  帧 {frame['frame_idx']} "
-                       f"(时间: {frame['timestamp']:.2f}s, "
-                       f"总分: {frame['change_score']:.2f}, "
-                       f"运动: {frame['motion_score']:.2f}, "
-                       f"场景: {frame['scene_score']:.2f})")
+        # 输出选中帧的信息（日志级别高于INFO时跳过逐帧格式化）
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("\n选中的关键帧:")
+            for i, frame in enumerate(selected_frames):
+                logger.info(f"  帧 {frame['frame_idx']} "
+                           f"(时间: {frame['timestamp']:.2f}s, "
+                           f"总分: {frame['change_score']:.2f}, "
+                           f"运动: {frame['motion_score']:.2f}, "
+                           f"场景: {frame['scene_score']:.2f})")
         
         return selected_frames
     
-    def image_to_base64(self, image_path: str, quality: int = 95) -> str:
-        """将图像文件转换为base64编码"""
+    def image_to_base64(self, image_path: Union[str, BytesIO], quality: int = 95) -> str:
+        """将图像文件（路径或内存中的文件对象）转换为base64编码"""
         try:
             with Image.open(image_path) as img:
                 # 转换为RGB模式（如果需要）
@@ -372,13 +609,80 @@ class SmartKeyFrameExtractor:
                 img_str = base64.b64encode(buffer.getvalue()).decode()
                 return img_str
         except Exception as e:
-            logger.error(f"转换图像到base64失败: {e}")
+            logger.error("转换图像到base64失败: %s", e)
             return ""
     
+    def _build_ffmpeg_output_args(self, scale_filter: Optional[str]) -> List[str]:
+        """构建与时间戳无关的FFmpeg输出参数，JPEG数据直接写到stdout，不经过临时文件"""
+        output_args = ['-frames:v', '1', '-q:v', '2']
+        
+        # 添加分辨率缩放参数
+        if scale_filter:
+            output_args.extend(['-vf', scale_filter])
+        
+        output_args.extend(['-f', 'image2pipe', '-c:v', 'mjpeg', 'pipe:1'])
+        return output_args
+    
+    def _extract_single_frame(self, ffmpeg_exe: str, video_path: str, idx: int,
+                              frame_info: Dict, output_args: List[str], resolution_info: str,
+                              output_dir: Optional[str], return_base64: bool,
+                              save_files: bool) -> Optional[Dict]:
+        """使用FFmpeg提取单帧，失败时返回None"""
+        timestamp = frame_info['timestamp']
+        
+        # 只输出错误信息，避免每个进程都通过管道传回版本横幅和流信息
+        cmd = [ffmpeg_exe, '-v', 'error', '-ss', str(timestamp), '-i', video_path]
+        cmd.extend(output_args)
+        
+        try:
+            completed = subprocess.run(cmd, capture_output=True, check=True)
+        except subprocess.CalledProcessError as e:
+            logger.error("提取帧失败: 时间 %.2fs, 错误: %s", timestamp, e)
+            return None
+        
+        jpeg_data = completed.stdout
+        if not jpeg_data:
+            logger.error("提取帧失败: 时间 %.2fs, FFmpeg未输出图像", timestamp)
+            return None
+        
+        frame_data = {
+            'frame_idx': frame_info['frame_idx'],
+            'timestamp': timestamp,
+            'change_score': frame_info['change_score'],
+            'motion_score': frame_info['motion_score'],
+            'scene_score': frame_info['scene_score'],
+            'resolution': resolution_info
+        }
+        
+        # 转换为base64
+        if return_base64:
+            base64_data = self.image_to_base64(BytesIO(jpeg_data))
+            frame_data['base64'] = base64_data
+            frame_data['format'] = 'jpeg'
+        
+        # 保存文件（如果需要）
+        if save_files and output_dir:
+            output_filename = f'keyframe-{idx+1:03d}.jpg'
+            output_path = os.path.join(output_dir, output_filename)
+            with open(output_path, 'wb') as f:
+                f.write(jpeg_data)
+            frame_data['path'] = output_path
+            frame_data['filename'] = output_filename
+            logger.info(f"已保存: {output_filename} ({frame_data['resolution']})")
+        
+        return frame_data
+    
     def extract_frames_with_ffmpeg(self, video_path: str, frame_info_list: List[Dict], 
                                   output_dir: str = None, resolution: str = 'original',
-                                  return_base64: bool = True, save_files: bool = False) -> List[Dict]:
-        """使用FFmpeg提取指定帧，支持base64输出"""
+                                  return_base64: bool = True, save_files: bool = False,
+                                  max_workers: int = DEFAULT_FFMPEG_WORKERS,
+                                  video_info: Optional[Dict] = None) -> List[Dict]:
+        """
+        使用FFmpeg提取指定帧，支持base64输出
+        
+        每帧由独立的FFmpeg进程提取，max_workers > 1 时并发执行，结果保持原有顺序。
+        若已获取过视频信息，可通过 video_info 传入以避免重复打开视频。
+        """
         
         # 如果需要保存文件但没有指定输出目录，创建临时目录
         if save_files and output_dir is None:
@@ -386,13 +690,15 @@ class SmartKeyFrameExtractor:
             logger.info(f"创建临时目录: {output_dir}")
         elif save_files:
             os.makedirs(output_dir, exist_ok=True)
-            # 清空目录
-            for file in os.listdir(output_dir):
-                if file.endswith(('.jpg', '.png')):
-                    os.unlink(os.path.join(output_dir, file))
+            # 清空目录（scandir 一次遍历即可拿到路径和文件类型）
+            with os.scandir(output_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(('.jpg', '.png')) and entry.is_file():
+                        os.unlink(entry.path)
         
         # 获取视频信息用于分辨率计算
-        video_info = self.get_video_info(video_path)
+        if video_info is None:
+            video_info = self.get_video_info(video_path)
         if not video_info:
             logger.error("无法获取视频信息")
             return []
@@ -401,71 +707,31 @@ class SmartKeyFrameExtractor:
         scale_filter, resolution_info = self.get_resolution_params(
             resolution, video_info['width'], video_info['height']
         )
+        if not resolution_info:
+            resolution_info = f"{video_info['width']}x{video_info['height']}"
         
-        saved_frames = []
+        # FFmpeg命令中与时间戳无关的部分每个视频只构建一次
+        ffmpeg_exe = _resolve_executable(self.ffmpeg_path) or self.ffmpeg_path
+        output_args = self._build_ffmpeg_output_args(scale_filter)
         
-        for idx, frame_info in enumerate(frame_info_list):
-            timestamp = frame_info['timestamp']
-            
-            # 创建临时文件用于FFmpeg输出
-            with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as temp_file:
-                temp_path = temp_file.name
-            
-            # 构建FFmpeg命令
-            cmd = [
-                self.ffmpeg_path,
-                '-ss', str(timestamp),
-                '-i', video_path,
-                '-frames:v', '1',
-                '-q:v', '2'
-            ]
-            
-            # 添加分辨率缩放参数
-            if scale_filter:
-                cmd.extend(['-vf', scale_filter])
-            
-            cmd.extend(['-y', temp_path])
-            
-            try:
-                subprocess.run(cmd, capture_output=True, check=True)
-                
-                if os.path.exists(temp_path):
-                    frame_data = {
-                        'frame_idx': frame_info['frame_idx'],
-                        'timestamp': timestamp,
-                        'change_score': frame_info['change_score'],
-                        'motion_score': frame_info['motion_score'],
-                        'scene_score': frame_info['scene_score'],
-                        'resolution': resolution_info if resolution_info else f"{video_info['width']}x{video_info['height']}"
-                    }
-                    
-                    # 转换为base64
-                    if return_base64:
-                        base64_data = self.image_to_base64(temp_path)
-                        frame_data['base64'] = base64_data
-                        frame_data['format'] = 'jpeg'
-                    
-                    # 保存文件（如果需要）
-                    if save_files and output_dir:
-                        output_filename = f'keyframe-{idx+1:03d}.jpg'
-                        output_path = os.path.join(output_dir, output_filename)
-                        shutil.copy2(temp_path, output_path)
-                        frame_data['path'] = output_path
-                        frame_data['filename'] = output_filename
-                        logger.info(f"已保存: {output_filename} ({frame_data['resolution']})")
-                    
-                    saved_frames.append(frame_data)
-                    
-                # 清理临时文件
-                os.unlink(temp_path)
-                    
-            except subprocess.CalledProcessError as e:
-                logger.error(f"提取帧失败: 时间 {timestamp:.2f}s, 错误: {e}")
-                # 清理临时文件
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
+        def extract(item):
+            idx, frame_info = item
+            return self._extract_single_frame(
+                ffmpeg_exe, video_path, idx, frame_info, output_args, resolution_info,
+                output_dir, return_base64, save_files
+            )
+        
+        items = list(enumerate(frame_info_list))
+        workers = max(1, min(max_workers, len(items)))
         
-        return saved_frames
+        if workers == 1:
+            results = [extract(item) for item in items]
+        else:
+            # FFmpeg在子进程中运行，线程池即可实现并行
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(extract, items))
+        
+        return [frame_data for frame_data in results if frame_data is not None]
 
 
 def extract_top_k_keyframes(video_path: str, output_dir: str = None, 
@@ -477,7 +743,10 @@ def extract_top_k_keyframes(video_path: str, output_dir: str = None,
                            max_frames: int = 30,
                            resolution: str = 'original',
                            return_base64: bool = True,
-                           save_files: bool = False) -> Dict:
+                           save_files: bool = False,
+                           cache_dir: str = None,
+                           max_workers: int = DEFAULT_FFMPEG_WORKERS,
+                           hw_accel: bool = False) -> Dict:
     """
     主函数：提取视频中变化最大的K帧，支持base64输出
     
@@ -493,6 +762,9 @@ def extract_top_k_keyframes(video_path: str, output_dir: str = None,
         resolution: 输出分辨率 - "original", "1080p", "720p", "480p", "360p", "240p"
         return_base64: 是否返回base64编码
         save_files: 是否保存文件到磁盘
+        cache_dir: 帧特征缓存目录（可选），重复处理同一视频时跳过解码和特征计算
+        max_workers: 并行提取关键帧的FFmpeg进程数
+        hw_accel: 分析帧变化时是否尝试使用硬件解码
     """
     
     logger.info(f"\n{'='*60}")
@@ -504,11 +776,14 @@ def extract_top_k_keyframes(video_path: str, output_dir: str = None,
     if not os.path.exists(video_path):
         return {'error': '视频文件不存在'}
     
+    start_time = time.perf_counter()
     extractor = SmartKeyFrameExtractor()
     
     # 1. 分析所有帧的变化
     logger.info("步骤 1/3: 分析视频帧变化...")
-    frame_changes, video_info = extractor.compute_frame_changes(video_path, sample_rate=1)
+    frame_changes, video_info = extractor.compute_frame_changes(
+        video_path, sample_rate=1, cache_dir=cache_dir, hw_accel=hw_accel
+    )
     
     if not frame_changes:
         return {'error': '无法分析视频'}
@@ -540,9 +815,15 @@ def extract_top_k_keyframes(video_path: str, output_dir: str = None,
     logger.info(f"\n步骤 3/3: 提取高质量关键帧...")
     saved_frames = extractor.extract_frames_with_ffmpeg(
         video_path, selected_frames, output_dir, resolution,
-        return_base64=return_base64, save_files=save_files
+        return_base64=return_base64, save_files=save_files,
+        max_workers=max_workers, video_info=video_info
     )
     
+    # 变化分数统计（一次性转换为数组后向量化计算）
+    change_scores = np.fromiter((f['change_score'] for f in frame_changes),
+                                dtype=np.float64, count=len(frame_changes))
+    p50_score, p95_score = np.percentile(change_scores, [50, 95])
+    
     # 生成分析报告
     result = {
         'video_path': video_path,
@@ -559,10 +840,13 @@ def extract_top_k_keyframes(video_path: str, output_dir: str = None,
         'save_files': save_files,
         'frames': saved_frames,
         'statistics': {
-            'max_change_score': max(f['change_score'] for f in frame_changes),
-            'avg_change_score': np.mean([f['change_score'] for f in frame_changes]),
+            'max_change_score': float(change_scores.max()),
+            'avg_change_score': float(change_scores.mean()),
+            'p50_change_score': float(p50_score),
+            'p95_change_score': float(p95_score),
             'selected_total_score': sum(f['change_score'] for f in saved_frames)
-        }
+        },
+        'processing_time': time.perf_counter() - start_time
     }
     
     # 输出总结
@@ -574,20 +858,22 @@ def extract_top_k_keyframes(video_path: str, output_dir: str = None,
     logger.info(f"分析帧数: {result['total_frames_analyzed']}")
     logger.info(f"提取帧数: {result['extracted_frames']}")
     logger.info(f"提取模式: {result['adaptive_mode']}")
+    logger.info(f"处理耗时: {result['processing_time']:.2f} 秒")
     logger.info(f"返回base64: {return_base64}")
     logger.info(f"保存文件: {save_files}")
     logger.info(f"最大变化分数: {result['statistics']['max_change_score']:.2f}")
     logger.info(f"平均变化分数: {result['statistics']['avg_change_score']:.2f}")
     logger.info(f"\n关键帧摘要:")
     
-    for i, frame in enumerate(saved_frames):
-        base64_info = f", base64长度 {len(frame.get('base64', ''))}" if return_base64 else ""
-        file_info = f", 文件 {frame.get('filename', 'N/A')}" if save_files else ""
-        logger.info(f"  - 帧 {i+1}: "
-                   f"时间 {frame['timestamp']:.1f}s, "
-                   f"变化分数 {frame['change_score']:.1f}, "
-                   f"分辨率 {frame.get('resolution', 'N/A')}"
-                   f"{base64_info}{file_info}")
+    if logger.isEnabledFor(logging.INFO):
+        for i, frame in enumerate(saved_frames):
+            base64_info = f", base64长度 {len(frame.get('base64', ''))}" if return_base64 else ""
+            file_info = f", 文件 {frame.get('filename', 'N/A')}" if save_files else ""
+            logger.info(f"  - 帧 {i+1}: "
+                       f"时间 {frame['timestamp']:.1f}s, "
+                       f"变化分数 {frame['change_score']:.1f}, "
+                       f"分辨率 {frame.get('resolution', 'N/A')}"
+                       f"{base64_info}{file_info}")
     
     if output_dir and save_files:
         logger.info(f"\n输出目录: {output_dir}")
@@ -596,6 +882,249 @@ def extract_top_k_keyframes(video_path: str, output_dir: str = None,
     return result
 
 
+def _file_size(path: str) -> int:
+    """返回文件大小，文件不存在时返回0"""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _extract_keyframes_worker(video_path: str, output_dir: Optional[str], kwargs: Dict) -> Dict:
+    """批量处理的工作进程入口（模块级函数以便跨进程序列化）"""
+    try:
+        result = extract_top_k_keyframes(video_path, output_dir, **kwargs)
+    except Exception as e:
+        logger.error("处理视频失败: %s, 错误: %s", video_path, e)
+        result = {'error': str(e)}
+    
+    result.setdefault('video_path', video_path)
+    return result
+
+
+def _batch_worker_init():
+    """
+    批量处理进程池的初始化函数，在每个工作进程启动时预热一次
+    
+    提前解析FFmpeg路径并在小尺寸合成帧上运行一次帧分析用到的OpenCV算子，
+    避免每个进程的第一个视频承担这些一次性初始化开销。
+    并行已经由进程池提供，每个进程内的OpenCV只使用单线程，避免线程数超额。
+    """
+    cv2.setNumThreads(1)
+    
+    for tool in ('ffmpeg', 'ffprobe'):
+        _resolve_executable(tool)
+    
+    frame = np.zeros((64, 64, 3), dtype=np.uint8)
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    cv2.calcOpticalFlowFarneback(gray, gray, None, **OPTICAL_FLOW_PARAMS)
+    cv2.calcHist([hsv], [0, 1], None, [50, 60], [0, 180, 0, 256])
+    cv2.Canny(gray, 50, 150)
+
+
+# 批量处理的进程池按 (进程数, 启动方式) 缓存，多次调用 extract_keyframes_batch 时复用已预热的工作进程
+_batch_executors: Dict[Tuple[int, Optional[str]], ProcessPoolExecutor] = {}
+# 每个缓存的进程池已提交的任务数，用于定期回收
+_batch_task_counts: Dict[Tuple[int, Optional[str]], int] = {}
+_batch_executors_lock = threading.Lock()
+
+
+def _get_batch_executor(workers: int, start_method: Optional[str] = None) -> ProcessPoolExecutor:
+    """
+    获取（必要时创建）指定进程数和启动方式的批量处理进程池，并记录一次任务提交
+    
+    OpenCV/FFmpeg在原生代码中分配的内存不受GC管理，进程池累计处理
+    BATCH_MAX_TASKS_PER_CHILD * workers 个任务后整体替换为新进程池。
+    在调用方按任务计数而不依赖 max_tasks_per_child，任何启动方式和Python版本都能回收。
+    """
+    key = (workers, start_method)
+    retired = None
+    with _batch_executors_lock:
+        executor = _batch_executors.get(key)
+        if executor is not None and _batch_task_counts[key] >= BATCH_MAX_TASKS_PER_CHILD * workers:
+            retired, executor = executor, None
+        if executor is None:
+            # start_method 为None时使用平台默认的启动方式
+            executor = ProcessPoolExecutor(max_workers=workers,
+                                           mp_context=multiprocessing.get_context(start_method),
+                                           initializer=_batch_worker_init)
+            _batch_executors[key] = executor
+            _batch_task_counts[key] = 0
+        _batch_task_counts[key] += 1
+    
+    if retired is not None:
+        # 已提交的任务会继续执行完，之后旧的工作进程退出
+        retired.shutdown(wait=False)
+    return executor
+
+
+def _discard_batch_executor(executor: ProcessPoolExecutor):
+    """移除已损坏的进程池，下次调用时重新创建"""
+    with _batch_executors_lock:
+        for key, cached in list(_batch_executors.items()):
+            if cached is executor:
+                del _batch_executors[key]
+                del _batch_task_counts[key]
+    executor.shutdown(wait=False)
+
+
+@atexit.register
+def _shutdown_batch_executors():
+    """解释器退出时关闭所有缓存的进程池"""
+    with _batch_executors_lock:
+        executors = list(_batch_executors.values())
+        _batch_executors.clear()
+        _batch_task_counts.clear()
+    for executor in executors:
+        executor.shutdown(wait=True)
+
+
+def extract_keyframes_batch(video_paths: List[str], output_dir: str = None,
+                            max_workers: Optional[int] = None,
+                            start_method: Optional[str] = None,
+                            ffmpeg_workers: Optional[int] = None, **kwargs) -> List[Dict]:
+    """
+    批量提取多个视频的关键帧，每个视频在独立进程中处理
+    
+    帧分析是CPU密集型任务，使用进程池可绕过GIL，充分利用多核。
+    较大的视频优先提交，以缩短整批的完成时间。进程池在多次调用之间复用。
+    
+    工作进程在执行任何OpenCV操作前先将OpenCV设为单线程，fork启动的子进程不会使用从父进程
+    继承的OpenCV线程池；若调用方本身在多个线程中使用OpenCV，建议传入
+    start_method="forkserver" 或 "spawn"。
+    
+    使用 "spawn" 启动方式时（Windows 和 macOS 的默认方式），工作进程会重新导入调用方的
+    主模块，调用代码必须放在 ``if __name__ == "__main__":`` 保护块中::
+    
+        if __name__ == "__main__":
+            results = extract_keyframes_batch(["a.mp4", "b.mp4"], k=5)
+    
+    Args:
+        video_paths: 视频文件路径列表
+        output_dir: 输出根目录（可选），每个视频的关键帧保存在以视频文件名命名的子目录中，
+                    文件名相同的视频会在子目录名后追加路径哈希以示区分
+        max_workers: 进程数，默认为CPU核数且不会超过CPU核数；为1时在当前进程中顺序处理
+        start_method: 进程启动方式（"fork"、"spawn"、"forkserver"），默认使用平台默认方式
+        ffmpeg_workers: 每个视频并发提取帧的FFmpeg进程数，默认在多进程处理时为1，
+                        避免进程数与FFmpeg并发数相乘导致CPU超额
+        **kwargs: 传递给extract_top_k_keyframes的其他参数
+    
+    Returns:
+        与video_paths顺序一致的结果列表，失败的视频结果中包含 'error'
+    """
+    if not video_paths:
+        return []
+    
+    if ffmpeg_workers is not None:
+        kwargs['max_workers'] = ffmpeg_workers
+    
+    # 按真实路径去重（符号链接、相对路径等指向同一文件时只处理一次）
+    unique_paths = []
+    job_of_path = {}
+    job_indices = []
+    for video_path in video_paths:
+        real_path = os.path.realpath(video_path)
+        if real_path not in job_of_path:
+            job_of_path[real_path] = len(unique_paths)
+            unique_paths.append((video_path, real_path))
+        job_indices.append(job_of_path[real_path])
+    
+    # 大小写不敏感的文件系统（Windows、macOS）上 Clip 与 clip 会落到同一目录
+    stem_counts = Counter(Path(video_path).stem.casefold() for video_path, _ in unique_paths)
+    jobs = [(video_path, _batch_output_dir(output_dir, video_path, real_path, stem_counts))
+            for video_path, real_path in unique_paths]
+    
+    if len(jobs) < len(video_paths):
+        logger.info(f"跳过 {len(video_paths) - len(jobs)} 个重复视频")
+    
+    results = _run_batch_jobs(jobs, max_workers, start_method, kwargs)
+    
+    # 重复的输入共享同一结果，各自保留调用方传入的路径
+    batch_results = []
+    seen_jobs = set()
+    for video_path, job_idx in zip(video_paths, job_indices):
+        result = results[job_idx]
+        if job_idx in seen_jobs:
+            result = dict(result, video_path=video_path)
+        seen_jobs.add(job_idx)
+        batch_results.append(result)
+    return batch_results
+
+
+def _batch_output_dir(output_dir: Optional[str], video_path: str, real_path: str,
+                      stem_counts: Dict[str, int]) -> Optional[str]:
+    """
+    返回视频在批量输出根目录下的子目录
+    
+    默认以视频文件名命名；不同目录下有同名视频时追加真实路径的短哈希，
+    避免多个视频写入同一子目录、互相清空和覆盖关键帧。
+    """
+    if not output_dir:
+        return None
+    
+    stem = Path(video_path).stem
+    if stem_counts[stem.casefold()] > 1:
+        digest = hashlib.blake2b(real_path.encode('utf-8'), digest_size=4).hexdigest()
+        stem = f"{stem}_{digest}"
+    return os.path.join(output_dir, stem)
+
+
+def _run_batch_jobs(jobs: List[Tuple[str, Optional[str]]], max_workers: Optional[int],
+                    start_method: Optional[str], kwargs: Dict) -> List[Dict]:
+    """执行去重后的批量任务，返回与jobs顺序一致的结果"""
+    # 帧分析是CPU密集型任务，进程数超过核数只会增加上下文切换
+    cpu_count = os.cpu_count() or 1
+    pool_size = max(1, min(max_workers or cpu_count, cpu_count))
+    # 进程池大小只取决于max_workers，任务较少时向同一个进程池提交即可，
+    # 不会因为每批视频数量不同而创建并常驻多个进程池
+    workers = min(pool_size, len(jobs))
+    logger.info(f"批量处理 {len(jobs)} 个视频，进程数: {workers}")
+    
+    if workers == 1:
+        return [_extract_keyframes_worker(video_path, video_output_dir, kwargs)
+                for video_path, video_output_dir in jobs]
+    
+    # 进程池已占满各核，每个视频内部不再并发启动FFmpeg
+    kwargs = dict(kwargs)
+    kwargs.setdefault('max_workers', 1)
+    
+    # 按文件大小从大到小提交（最长任务优先），避免大视频排在最后拖长总耗时
+    submit_order = sorted(range(len(jobs)), key=lambda i: -_file_size(jobs[i][0]))
+    
+    # 同时最多保留 2 * workers 个未完成任务，避免大批量时一次性提交全部任务
+    max_in_flight = 2 * workers
+    results = [None] * len(jobs)
+    pending = {}
+    executor = None
+    try:
+        for i in submit_order:
+            if len(pending) >= max_in_flight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+            
+            previous, executor = executor, _get_batch_executor(pool_size, start_method)
+            if previous is not None and executor is not previous:
+                # 进程池已被回收替换，先等旧进程池上的任务完成，避免新旧进程同时占用CPU
+                for future in as_completed(pending):
+                    results[pending[future]] = future.result()
+                pending.clear()
+            
+            video_path, video_output_dir = jobs[i]
+            future = executor.submit(_extract_keyframes_worker, video_path,
+                                     video_output_dir, kwargs)
+            pending[future] = i
+        
+        for future in as_completed(pending):
+            results[pending[future]] = future.result()
+    except BrokenProcessPool:
+        # 工作进程异常退出后进程池不可再用
+        _discard_batch_executor(executor)
+        raise
+    return results
+
+
 def main():
     import argparse
     
@@ -640,6 +1169,12 @@ def main():
                        help='返回base64编码（用于AI分析）')
     parser.add_argument('--save-files', action='store_true',
                        help='保存图像文件到磁盘')
+    parser.add_argument('--cache-dir',
+                       help='帧特征缓存目录，重复处理同一视频时跳过帧分析')
+    parser.add_argument('--workers', type=int, default=DEFAULT_FFMPEG_WORKERS,
+                       help='并行提取关键帧的FFmpeg进程数')
+    parser.add_argument('--hw-accel', action='store_true',
+                       help='分析帧变化时尝试使用硬件解码')
     
     args = parser.parse_args()
     
@@ -668,7 +1203,10 @@ def main():
         max_frames=args.max_frames,
         resolution=args.resolution,
         return_base64=args.base64,
-        save_files=args.save_files
+        save_files=args.save_files,
+        cache_dir=args.cache_dir,
+        max_workers=args.workers,
+        hw_accel=args.hw_accel
     )
     
     if 'error' in result:
@@ -677,14 +1215,14 @@ def main():
     
     # 输出base64结果（用于Azure OpenAI分析）
     if args.base64:
-        print("\n" + "="*50)
-        print("Azure OpenAI 分析用 Base64 数据:")
-        print("="*50)
+        # 先拼接全部输出再一次性写入，避免逐行print
+        lines = ["\n" + "="*50, "Azure OpenAI 分析用 Base64 数据:", "="*50]
         for i, frame in enumerate(result['frames']):
             if 'base64' in frame:
-                print(f"\n帧 {i+1} (时间: {frame['timestamp']:.1f}s):")
-                print(f"data:image/jpeg;base64,{frame['base64'][:100]}...")
-                print(f"完整长度: {len(frame['base64'])} 字符")
+                lines.append(f"\n帧 {i+1} (时间: {frame['timestamp']:.1f}s):")
+                lines.append(f"data:image/jpeg;base64,{frame['base64'][:100]}...")
+                lines.append(f"完整长度: {len(frame['base64'])} 字符")
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
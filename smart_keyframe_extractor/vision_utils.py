@@ -6,12 +6,12 @@
 from __future__ import annotations
 
 import base64
+import functools
 import math
 import warnings
 from io import BytesIO
 from typing import Union, List, Dict, Tuple, Optional
 
-import requests
 import numpy as np
 from PIL import Image
 
@@ -47,6 +47,7 @@ def floor_by_factor(number: int, factor: int) -> int:
     return math.floor(number / factor) * factor
 
 
+@functools.lru_cache(maxsize=256)
 def smart_resize(
     height: int, 
     width: int, 
@@ -60,6 +61,8 @@ def smart_resize(
     1. 高度和宽度都能被 'factor' 整除
     2. 总像素数在 ['min_pixels', 'max_pixels'] 范围内
     3. 尽可能保持原始宽高比
+    
+    结果只取决于输入参数，按参数缓存，批量处理同尺寸图像时不重复计算
     """
     if max(height, width) / min(height, width) > MAX_RATIO:
         raise ValueError(
@@ -102,6 +105,8 @@ def fetch_image(ele: dict[str, str | Image.Image], size_factor: int = IMAGE_FACT
     if isinstance(image, Image.Image):
         image_obj = image
     elif image.startswith("http://") or image.startswith("https://"):
+        # requests只在加载网络图片时需要，按需导入以缩短包的导入时间
+        import requests
         response = requests.get(image, stream=True)
         response.raise_for_status()
         image_obj = Image.open(response.raw)
@@ -3,6 +3,7 @@
 import pytest
 import tempfile
 import os
+import subprocess
 from unittest.mock import Mock, patch
 from smart_keyframe_extractor import extract_top_k_keyframes, SmartKeyFrameExtractor
 
@@ -48,6 +49,120 @@ class TestSmartKeyFrameExtractor:
             # Test interval mode
             count = extractor.calculate_adaptive_frame_count(60, mode="interval", interval=10, frames_per_interval=2)
             assert count >= 3
+    
+    def test_resolve_executable_retries_missing_tools(self):
+        """Test a missing executable is looked up again instead of cached"""
+        from smart_keyframe_extractor import extractor as extractor_module
+        
+        with patch.dict(extractor_module._executable_paths, clear=True), \
+                patch('smart_keyframe_extractor.extractor.shutil.which',
+                      side_effect=[None, '/usr/bin/fake-tool']) as mock_which:
+            assert extractor_module._resolve_executable('fake-tool') is None
+            assert extractor_module._resolve_executable('fake-tool') == '/usr/bin/fake-tool'
+            assert extractor_module._resolve_executable('fake-tool') == '/usr/bin/fake-tool'
+            assert mock_which.call_count == 2
+    
+    def test_frame_reader_errors_propagate(self):
+        """Test decode errors in the reader thread are re-raised to the caller"""
+        with patch.object(SmartKeyFrameExtractor, '_check_installations'):
+            extractor = SmartKeyFrameExtractor()
+        
+        cap = Mock()
+        cap.grab.return_value = True
+        cap.retrieve.side_effect = RuntimeError("decode failed")
+        
+        with pytest.raises(RuntimeError, match="decode failed"):
+            list(extractor._iter_sampled_frames(cap, sample_rate=1, scale_factor=0.25))
+    
+    def test_open_capture_missing_file_and_hw_backend(self):
+        """Test missing files skip backend probing and hardware decoding uses the FFmpeg backend"""
+        import cv2
+        
+        with patch('smart_keyframe_extractor.extractor.cv2.VideoCapture') as mock_capture:
+            SmartKeyFrameExtractor._open_capture("nonexistent.mp4", hw_accel=True)
+            mock_capture.assert_called_once_with()
+        
+        if not hasattr(cv2, 'CAP_PROP_HW_ACCELERATION'):
+            return
+        with tempfile.NamedTemporaryFile(suffix='.mp4') as temp_file, \
+                patch('smart_keyframe_extractor.extractor.cv2.VideoCapture') as mock_capture:
+            mock_capture.return_value.isOpened.return_value = True
+            SmartKeyFrameExtractor._open_capture(temp_file.name, hw_accel=True)
+            assert mock_capture.call_args[0][:2] == (temp_file.name, cv2.CAP_FFMPEG)
+    
+    def test_feature_cache(self):
+        """Test cached frame features skip video decoding"""
+        with patch.object(SmartKeyFrameExtractor, '_check_installations'):
+            extractor = SmartKeyFrameExtractor()
+        
+        frame_changes = [
+            {'frame_idx': 0, 'timestamp': 0.0, 'change_score': 0.0, 'scene_score': 0.0,
+             'motion_score': 0.0, 'color_score': 0.0, 'edge_score': 0.0},
+            {'frame_idx': 1, 'timestamp': 0.5, 'change_score': 12.5, 'scene_score': 3.0,
+             'motion_score': 1.5, 'color_score': 0.2, 'edge_score': 4.0},
+        ]
+        video_info = {'total_frames': 2, 'fps': 2.0, 'width': 640, 'height': 480, 'duration': 1.0}
+        
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                tempfile.NamedTemporaryFile(suffix='.mp4') as temp_file:
+            cache_path = extractor._feature_cache_path(temp_file.name, 1, cache_dir)
+            extractor._save_feature_cache(cache_path, frame_changes, video_info)
+            
+            with patch('smart_keyframe_extractor.extractor.cv2.VideoCapture') as mock_capture:
+                cached_changes, cached_info = extractor.compute_frame_changes(
+                    temp_file.name, cache_dir=cache_dir
+                )
+                mock_capture.assert_not_called()
+            
+            assert cached_changes == frame_changes
+            assert cached_info == video_info
+            
+            # 采样率不同时使用不同的缓存文件
+            assert extractor._feature_cache_path(temp_file.name, 2, cache_dir) != cache_path
+    
+    def test_feature_cache_corrupt_or_missing_video(self):
+        """Test corrupt cache files are discarded and missing videos return empty results"""
+        with patch.object(SmartKeyFrameExtractor, '_check_installations'):
+            extractor = SmartKeyFrameExtractor()
+    
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                tempfile.NamedTemporaryFile(suffix='.mp4') as temp_file:
+            cache_path = extractor._feature_cache_path(temp_file.name, 1, cache_dir)
+            with open(cache_path, 'wb') as f:
+                f.write(b'PK\x03\x04truncated')
+    
+            assert extractor._load_feature_cache(cache_path) == ([], {})
+            assert not os.path.exists(cache_path)
+    
+            missing = os.path.join(cache_dir, 'missing.mp4')
+            assert extractor.compute_frame_changes(missing, cache_dir=cache_dir) == ([], {})
+    
+    def test_extract_frames_parallel_order_and_failures(self):
+        """Test parallel FFmpeg extraction keeps order and drops failed frames"""
+        with patch.object(SmartKeyFrameExtractor, '_check_installations'):
+            extractor = SmartKeyFrameExtractor()
+        
+        frame_info_list = [
+            {'frame_idx': i, 'timestamp': float(i), 'change_score': 0.0,
+             'motion_score': 0.0, 'scene_score': 0.0}
+            for i in range(6)
+        ]
+        video_info = {'total_frames': 6, 'fps': 1.0, 'width': 640, 'height': 480, 'duration': 6.0}
+        
+        def fake_run(cmd, **kwargs):
+            timestamp = float(cmd[cmd.index('-ss') + 1])
+            if timestamp == 1.0:
+                raise subprocess.CalledProcessError(1, cmd)
+            stdout = b'' if timestamp == 4.0 else b'jpeg'
+            return subprocess.CompletedProcess(cmd, 0, stdout=stdout, stderr=b'')
+        
+        with patch('smart_keyframe_extractor.extractor.subprocess.run', side_effect=fake_run):
+            frames = extractor.extract_frames_with_ffmpeg(
+                'video.mp4', frame_info_list, return_base64=False,
+                max_workers=3, video_info=video_info
+            )
+        
+        assert [frame['frame_idx'] for frame in frames] == [0, 2, 3, 5]
 
 
 class TestExtractFunction:
@@ -66,6 +181,82 @@ class TestExtractFunction:
             # This will still fail because it's not a valid video, but tests parameter handling
             result = extract_top_k_keyframes(temp_file.name, k=-1)
             # Should handle the parameter correctly even if video processing fails
+    
+    def test_batch_extraction(self):
+        """Test batch extraction keeps input order and reports failures"""
+        from smart_keyframe_extractor import extract_keyframes_batch
+        
+        def fake_extract(video_path, output_dir=None, **kwargs):
+            if video_path == "broken.mp4":
+                raise RuntimeError("decode failed")
+            return {'video_path': video_path, 'output_dir': output_dir, 'k': kwargs['k'],
+                    'ffmpeg_workers': kwargs.get('max_workers')}
+        
+        with patch('smart_keyframe_extractor.extractor.extract_top_k_keyframes',
+                   side_effect=fake_extract) as mock_extract:
+            results = extract_keyframes_batch(
+                ["a.mp4", "missing.mp4", "broken.mp4", "./a.mp4"],
+                output_dir="out", max_workers=1, ffmpeg_workers=2, k=3
+            )
+        
+        # 重复路径只处理一次，但结果仍按输入逐一返回
+        assert mock_extract.call_count == 3
+        assert [r['video_path'] for r in results] == ["a.mp4", "missing.mp4", "broken.mp4", "./a.mp4"]
+        assert results[3]['output_dir'] == results[0]['output_dir']
+        assert results[0]['output_dir'] == os.path.join("out", "a")
+        assert results[0]['k'] == 3
+        assert results[0]['ffmpeg_workers'] == 2
+        assert results[2]['error'] == "decode failed"
+        assert extract_keyframes_batch([]) == []
+    
+    def test_batch_output_dirs_unique_for_same_stem(self):
+        """Test videos sharing a file name get separate output directories"""
+        from smart_keyframe_extractor import extract_keyframes_batch
+        
+        def fake_extract(video_path, output_dir=None, **kwargs):
+            return {'video_path': video_path, 'output_dir': output_dir}
+        
+        with patch('smart_keyframe_extractor.extractor.extract_top_k_keyframes',
+                   side_effect=fake_extract):
+            results = extract_keyframes_batch(
+                [os.path.join("a", "clip.mp4"), os.path.join("b", "Clip.mp4"), "other.mp4"],
+                output_dir="out", max_workers=1
+            )
+        
+        output_dirs = [r['output_dir'] for r in results]
+        assert len({d.casefold() for d in output_dirs}) == 3
+        assert os.path.basename(output_dirs[0]).startswith("clip_")
+        assert os.path.basename(output_dirs[1]).startswith("Clip_")
+        assert output_dirs[2] == os.path.join("out", "other")
+    
+    def test_batch_pool_recycled_after_task_limit(self):
+        """Test the cached batch pool is replaced after BATCH_MAX_TASKS_PER_CHILD * workers tasks"""
+        from concurrent.futures import ThreadPoolExecutor
+        from smart_keyframe_extractor import extractor as extractor_module
+        
+        def fake_pool(max_workers, mp_context=None, initializer=None):
+            return ThreadPoolExecutor(max_workers=max_workers)
+        
+        def fake_extract(video_path, output_dir=None, **kwargs):
+            return {'video_path': video_path, 'ffmpeg_workers': kwargs['max_workers']}
+        
+        with patch.dict(extractor_module._batch_executors, clear=True), \
+                patch.dict(extractor_module._batch_task_counts, clear=True), \
+                patch.object(extractor_module, 'BATCH_MAX_TASKS_PER_CHILD', 1), \
+                patch.object(extractor_module, 'ProcessPoolExecutor',
+                             side_effect=fake_pool) as mock_pool, \
+                patch('smart_keyframe_extractor.extractor.os.cpu_count', return_value=2), \
+                patch('smart_keyframe_extractor.extractor.extract_top_k_keyframes',
+                      side_effect=fake_extract):
+            videos = [f"video{i}.mp4" for i in range(5)]
+            results = extractor_module.extract_keyframes_batch(videos, max_workers=2)
+            for executor in extractor_module._batch_executors.values():
+                executor.shutdown(wait=True)
+        
+        # 每个进程池处理 1 * 2 个任务后被替换
+        assert mock_pool.call_count == 3
+        assert [r['video_path'] for r in results] == videos
+        assert all(r['ffmpeg_workers'] == 1 for r in results)
 
 
 class TestVisionUtils:
@@ -161,6 +352,73 @@ class TestAzureOpenAI:
         assert result['analysis'] == "Test analysis result"
         assert result['usage']['total_tokens'] == 150
         assert result['frames_analyzed'] == 2
+    
+    def test_batch_analyze_videos_keeps_order(self):
+        """Test concurrent batch analysis returns results in input order"""
+        import time
+        from smart_keyframe_extractor.azure_openai import AzureOpenAIAnalyzer
+        
+        analyzer = AzureOpenAIAnalyzer(
+            api_key="test_key",
+            endpoint="https://test.openai.azure.com/"
+        )
+        
+        def fake_analyze(frames, **kwargs):
+            # 前面的视频耗时更长，完成顺序与输入顺序相反
+            delay = frames[0]['delay']
+            time.sleep(delay)
+            return {'success': True, 'analysis': f"done {delay}"}
+        
+        video_results = [
+            {'video_path': 'a.mp4', 'frames': [{'delay': 0.06}]},
+            {'video_path': 'b.mp4', 'frames': []},
+            {'video_path': 'c.mp4', 'frames': [{'delay': 0.03}]},
+            {'video_path': 'd.mp4', 'frames': [{'delay': 0.0}]},
+        ]
+        
+        with patch.object(AzureOpenAIAnalyzer, 'analyze_video_frames',
+                          side_effect=fake_analyze) as mock_analyze:
+            results = analyzer.batch_analyze_videos(video_results, max_workers=3)
+        
+        assert mock_analyze.call_count == 3
+        assert [r['video_path'] for r in results] == ['a.mp4', 'b.mp4', 'c.mp4', 'd.mp4']
+        assert results[0]['analysis'] == "done 0.06"
+        assert results[1]['success'] is False
+    
+    @staticmethod
+    def _reset_azure_exports(package):
+        for name in package._AZURE_EXPORTS + ("_has_azure", "__all__"):
+            package.__dict__.pop(name, None)
+    
+    def test_package_exports_azure_when_available(self):
+        """Test the package exposes the Azure names lazily when openai is importable"""
+        import smart_keyframe_extractor as package
+        from smart_keyframe_extractor.azure_openai import AzureOpenAIAnalyzer
+        
+        self._reset_azure_exports(package)
+        try:
+            assert package.AzureOpenAIAnalyzer is AzureOpenAIAnalyzer
+            assert package._has_azure is True
+            assert "analyze_video_with_azure_openai" in package.__all__
+        finally:
+            self._reset_azure_exports(package)
+    
+    def test_package_azure_names_none_without_openai(self):
+        """Test the Azure names are None and left out of __all__ when openai is missing"""
+        import sys
+        import smart_keyframe_extractor as package
+        
+        self._reset_azure_exports(package)
+        try:
+            with patch.dict(sys.modules, {'openai': None}):
+                sys.modules.pop('smart_keyframe_extractor.azure_openai', None)
+                assert hasattr(package, "AzureOpenAIAnalyzer")
+                assert package.AzureOpenAIAnalyzer is None
+                assert package.analyze_video_with_azure_openai is None
+                assert package._has_azure is False
+                assert "AzureOpenAIAnalyzer" not in package.__all__
+        finally:
+            self._reset_azure_exports(package)
 
 
 if __name__ == "__main__":